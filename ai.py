@@ -3,11 +3,13 @@ import os
 from dotenv import load_dotenv
 from datetime import datetime
 import re
+import threading
+from status_store import StatusStore
 
 load_dotenv()
 
 class RiverwoodAI:
-    def __init__(self):
+    def __init__(self, status_store: StatusStore = None):
         self.client = None
         self.available_models = [
             "llama-3.1-8b-instant",
@@ -19,16 +21,14 @@ class RiverwoodAI:
         self.initialize_groq_client()
         self.conversation_context = []
         
-        self.construction_updates = {
-            "current_status": {
-                "foundation": "100% completed",
-                "structural": "85% completed", 
-                "electrical": "60% completed",
-                "plumbing": "55% completed",
-                "next_milestone": "Structural completion by next Friday",
-                "site_visits": "Monday-Saturday, 10 AM - 5 PM"
-            }
-        }
+        # Per-project construction status, hot-reloaded from STATUS_SOURCE
+        self.status_store = status_store or StatusStore()
+        self.status_store.subscribe(self.invalidate_project_caches)
+        self.status_store.start_watching()
+        
+        # System prompts keyed by (project_id, language) -> (project version, prompt)
+        self._prompt_cache = {}
+        self._prompt_cache_lock = threading.Lock()
     
     def detect_language(self, text: str) -> str:
         """Simple and reliable language detection"""
@@ -105,22 +105,44 @@ class RiverwoodAI:
                 continue
         return None
     
-    def generate_response(self, user_input: str, conversation_history: list = None):
+    def generate_response(self, user_input: str, conversation_history: list = None, project_id: str = None):
         """Generate contextual response using Groq LLM with fallback"""
         # Detect user's language
         user_language = self.detect_language(user_input)
         print(f"🗣️ User language detected: {user_language}")
         print(f"📝 User input: {user_input}")
         
+        project_id, project = self._get_project(project_id)
+        
         # First, try Groq API
-        groq_response = self._try_groq_api(user_input, user_language, conversation_history)
+        groq_response = self._try_groq_api(user_input, user_language, conversation_history, project_id, project)
         if groq_response:
             return groq_response
         
         # If Groq fails, use fallback responses in the same language
-        return self._fallback_response(user_input, user_language)
+        return self._fallback_response(user_input, user_language, project["status"])
+    
+    def resolve_project_id(self, project_id: str = None) -> str:
+        """Return the project id to use (default when None); raises ValueError if unknown"""
+        return self._get_project(project_id)[0]
     
-    def _try_groq_api(self, user_input: str, user_language: str, conversation_history: list = None):
+    def _get_project(self, project_id: str = None):
+        """Look up a project's status entry; raises ValueError if the project is unknown"""
+        project_id = project_id or self.status_store.default_project_id
+        project = self.status_store.get(project_id)
+        if project is None:
+            raise ValueError(f"Unknown project: {project_id}")
+        return project_id, project
+    
+    def invalidate_project_caches(self, project_ids):
+        """Drop cached prompts for the given projects only"""
+        with self._prompt_cache_lock:
+            for key in [key for key in self._prompt_cache if key[0] in project_ids]:
+                del self._prompt_cache[key]
+        print(f"🧹 Prompt cache invalidated for: {', '.join(sorted(project_ids))}")
+    
+    def _try_groq_api(self, user_input: str, user_language: str, conversation_history: list = None,
+                      project_id: str = None, project: dict = None):
         """Try to get response from Groq API"""
         if not self.client:
             print("❌ Groq client not available")
@@ -130,7 +152,10 @@ class RiverwoodAI:
             print(f"🔄 Sending request to Groq ({self.current_model}): {user_input[:50]}...")
             
             # Build conversation context with STRICT language guidance
-            messages = self._build_prompt(user_input, user_language, conversation_history or [])
+            if project is None:
+                project_id, project = self._get_project(project_id)
+            system_prompt = self._get_system_prompt(project_id, project, user_language)
+            messages = self._build_prompt(user_input, system_prompt, conversation_history or [])
             
             # Get response from Groq
             completion = self.client.chat.completions.create(
@@ -150,17 +175,51 @@ class RiverwoodAI:
             print(f"❌ Groq API error: {e}")
             return None
     
-    def _fallback_response(self, user_input: str, user_language: str) -> str:
+    def _fallback_response(self, user_input: str, user_language: str, status: dict = None) -> str:
         """Provide fallback responses in the same language as user"""
+        updates = self._status_fields(status or {})
         if user_language == "hindi":
-            return "नमस्ते सर। कंस्ट्रक्शन प्रगति पर है। फाउंडेशन पूरा, स्ट्रक्चरल 85% पूरा। विजिट: सोम-शनि, 10-5 बजे।"
+            status = status or {}
+            response = "नमस्ते सर। कंस्ट्रक्शन प्रगति पर है।"
+            foundation = self._hindi_value(status, "foundation")
+            structural = self._hindi_value(status, "structural")
+            if foundation and structural:
+                response += f" फाउंडेशन {foundation}, स्ट्रक्चरल {structural}।"
+            if status.get("site_visits_hi"):
+                response += f" विजिट: {status['site_visits_hi']}।"
+            return response
         else:
-            return "Hello Sir. Construction is progressing well. Foundation complete, structural 85% done. Visits: Mon-Sat, 10AM-5PM."
+            return (f"Hello Sir. Construction is progressing well. Foundation: {updates['foundation']}, "
+                    f"structural: {updates['structural']}. Visits: {updates['site_visits']}.")
     
-    def _build_prompt(self, user_input: str, user_language: str, conversation_history: list):
-        """Build the prompt with STRICT language enforcement"""
+    def _hindi_value(self, status: dict, field: str):
+        """Hindi-safe value for a field: its "<field>_hi" entry, else just the percentage"""
+        if status.get(f"{field}_hi"):
+            return status[f"{field}_hi"]
+        match = re.search(r'\d+(?:\.\d+)?\s*%', status.get(field, ""))
+        return f"{match.group(0)} पूरा" if match else None
+    
+    def _status_fields(self, status: dict) -> dict:
+        """Fill in any field a project's status source leaves out"""
+        fields = ["foundation", "structural", "electrical", "plumbing", "next_milestone", "site_visits"]
+        return {field: status.get(field, "N/A") for field in fields}
+    
+    def _get_system_prompt(self, project_id: str, project: dict, user_language: str) -> str:
+        """Return the cached system prompt for a project, rebuilding it if the project changed"""
+        key = (project_id, user_language)
+        cached = self._prompt_cache.get(key)
+        if cached and cached[0] == project["version"]:
+            return cached[1]
         
-        updates = self.construction_updates["current_status"]
+        system_prompt = self._build_system_prompt(project["status"], user_language)
+        with self._prompt_cache_lock:
+            self._prompt_cache[key] = (project["version"], system_prompt)
+        return system_prompt
+    
+    def _build_system_prompt(self, status: dict, user_language: str) -> str:
+        """Build the system prompt with STRICT language enforcement"""
+        
+        updates = self._status_fields(status)
         
         if user_language == "hindi":
             system_prompt = f"""आप रिवरवुड प्रोजेक्ट्स के लिए एक पेशेवर AI वॉइस असिस्टेंट हैं।
@@ -184,9 +243,9 @@ class RiverwoodAI:
 - साइट विजिट: {updates['site_visits']}
 
 **उदाहरण प्रतिक्रियाएं (हिंदी में ही):**
-- "नमस्ते सर। कंस्ट्रक्शन प्रगति पर है। फाउंडेशन पूरा, स्ट्रक्चरल 85% पूरा।"
-- "साइट विजिट सोमवार से शनिवार, 10-5 बजे तक है।"
-- "विद्युत कार्य 60% और प्लंबिंग 55% पूरा हो चुका है।"
+- "नमस्ते सर। कंस्ट्रक्शन प्रगति पर है। फाउंडेशन: {updates['foundation']}, स्ट्रक्चरल: {updates['structural']}।"
+- "साइट विजिट: {updates['site_visits']}।"
+- "विद्युत कार्य: {updates['electrical']}, प्लंबिंग: {updates['plumbing']}।"
 
 **याद रखें: केवल हिंदी में जवाब दें। अंग्रेजी में नहीं।**"""
         
@@ -212,12 +271,16 @@ class RiverwoodAI:
 - Site Visits: {updates['site_visits']}
 
 **Example Responses (English only):**
-- "Hello Sir. Construction is progressing well. Foundation complete, structural 85% done."
-- "Site visits are Monday to Saturday, 10AM to 5PM."
-- "Electrical work is 60% and plumbing is 55% complete."
+- "Hello Sir. Construction is progressing well. Foundation: {updates['foundation']}, structural: {updates['structural']}."
+- "Site visits: {updates['site_visits']}."
+- "Electrical work: {updates['electrical']}, plumbing: {updates['plumbing']}."
 
 **REMEMBER: Respond ONLY in English. NOT in Hindi.**"""
         
+        return system_prompt
+    
+    def _build_prompt(self, user_input: str, system_prompt: str, conversation_history: list):
+        """Assemble the message list from the system prompt, recent history and user input"""
         messages = [{"role": "system", "content": system_prompt}]
         
         # Add conversation history for context
@@ -230,9 +293,13 @@ class RiverwoodAI:
         
         return messages
     
-    def get_construction_update(self):
-        """Get current construction status"""
+    def get_construction_update(self, project_id: str = None):
+        """Get current construction status for a project"""
+        project_id, project = self._get_project(project_id)
         return {
             "timestamp": datetime.now().isoformat(),
-            "updates": self.construction_updates
+            "project_id": project_id,
+            "version": project["version"],
+            "updated_at": project["updated_at"],
+            "updates": {"current_status": project["status"]}
         }
\ No newline at end of file
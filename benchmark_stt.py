@@ -0,0 +1,179 @@
+"""
+Compare Whisper WER and latency across model sizes and inference precisions.
+
+Test set layout: a directory of audio clips, each with a reference transcript
+next to it using the same name and a .txt extension, e.g.
+
+    testset/
+        site_status_01.wav
+        site_status_01.txt
+        visit_hours_hi.mp3
+        visit_hours_hi.txt
+
+Each configuration runs in a fresh process, so the peak RSS column is what a
+single worker holding that model needs. On Windows peak RSS needs psutil and is
+reported as N/A without it.
+
+Usage:
+    python benchmark_stt.py testset --sizes tiny base small --precisions fp32 int8
+"""
+import argparse
+import glob
+import io
+import multiprocessing
+import os
+import sys
+import time
+import unicodedata
+
+import torch
+import whisper
+
+from voice_handler import load_whisper_model, SUPPORTED_PRECISIONS, WHISPER_CACHE_DIR
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".webm", ".m4a", ".flac", ".ogg")
+
+
+def normalize_text(text: str) -> list:
+    """Lowercase and drop punctuation/symbols, keeping Devanagari vowel signs intact"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(" " if unicodedata.category(c)[0] in "PS" else c for c in text)
+    return text.split()
+
+
+def word_errors(reference: list, hypothesis: list) -> int:
+    """Word-level Levenshtein distance (substitutions + deletions + insertions)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def load_test_set(data_dir: str) -> list:
+    """Collect (audio_path, reference_text) pairs"""
+    samples = []
+    for audio_path in sorted(glob.glob(os.path.join(data_dir, "*"))):
+        stem, ext = os.path.splitext(audio_path)
+        if ext.lower() not in AUDIO_EXTENSIONS or not os.path.exists(stem + ".txt"):
+            continue
+        with open(stem + ".txt", encoding="utf-8") as f:
+            samples.append((audio_path, f.read().strip()))
+    return samples
+
+
+def weights_size_mb(model) -> float:
+    """Serialized state_dict size (weights only, excludes activations and runtime overhead)"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if it cannot be measured"""
+    if sys.platform == "win32":
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except ImportError:
+            return None
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_config(samples: list, model_size: str, precision: str, cache_dir: str, language: str,
+               threads: int) -> dict:
+    """Transcribe the whole test set with one model configuration"""
+    if threads > 0:
+        torch.set_num_threads(threads)
+
+    start = time.perf_counter()
+    model, fp16, precision = load_whisper_model(model_size, precision, cache_dir)
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up pass so one-off kernel setup does not skew the first sample
+    model.transcribe(samples[0][0], fp16=fp16, language=language, task="transcribe")
+
+    total_errors = 0
+    total_words = 0
+    total_latency = 0.0
+    total_audio = 0.0
+    for audio_path, reference in samples:
+        audio = whisper.load_audio(audio_path)
+        total_audio += len(audio) / whisper.audio.SAMPLE_RATE
+
+        start = time.perf_counter()
+        result = model.transcribe(audio, fp16=fp16, language=language, task="transcribe")
+        total_latency += time.perf_counter() - start
+
+        reference_words = normalize_text(reference)
+        total_errors += word_errors(reference_words, normalize_text(result["text"]))
+        total_words += len(reference_words)
+
+    return {
+        "model": model_size,
+        "precision": precision,
+        "device": str(model.device),
+        "weights_mb": weights_size_mb(model),
+        "peak_rss_mb": peak_rss_mb(),
+        "load_s": load_seconds,
+        "avg_latency_s": total_latency / len(samples),
+        "rtf": total_latency / total_audio if total_audio else 0.0,
+        "wer": total_errors / total_words if total_words else 0.0,
+    }
+
+
+def print_report(results: list):
+    header = (f"{'model':<8} {'precision':<10} {'device':<7} {'weights MB':>10} {'peak RSS MB':>11} "
+              f"{'load s':>8} {'avg s':>8} {'RTF':>6} {'WER %':>7}")
+    print()
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        peak_rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "N/A"
+        print(f"{r['model']:<8} {r['precision']:<10} {r['device']:<7} {r['weights_mb']:>10.1f} {peak_rss:>11} "
+              f"{r['load_s']:>8.2f} {r['avg_latency_s']:>8.2f} {r['rtf']:>6.2f} {r['wer'] * 100:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper WER vs latency comparison")
+    parser.add_argument("data_dir", help="Directory of audio clips with matching .txt transcripts")
+    parser.add_argument("--sizes", nargs="+", default=["base"], help="Whisper model sizes to compare")
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8"], choices=SUPPORTED_PRECISIONS)
+    parser.add_argument("--language", default=None, help="Force a language (e.g. en, hi); auto-detect by default")
+    parser.add_argument("--cache-dir", default=WHISPER_CACHE_DIR, help="Where quantized weights are cached")
+    parser.add_argument("--threads", type=int, default=0, help="torch CPU threads (0 = torch default)")
+    args = parser.parse_args()
+
+    samples = load_test_set(args.data_dir)
+    if not samples:
+        print(f"No audio clips with matching .txt transcripts found in {args.data_dir}")
+        return
+    print(f"Loaded {len(samples)} test samples from {args.data_dir}")
+
+    # A fresh process per configuration keeps peak RSS from carrying over between models
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for model_size in args.sizes:
+        for precision in args.precisions:
+            print(f"Benchmarking {model_size} ({precision})...")
+            with context.Pool(1) as pool:
+                results.append(pool.apply(
+                    run_config,
+                    (samples, model_size, precision, args.cache_dir, args.language, args.threads)
+                ))
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
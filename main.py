@@ -1,4 +1,4 @@
-﻿from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
+﻿from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Form, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -28,8 +28,11 @@ app.add_middleware(
 voice_handler = VoiceHandler()
 ai_agent = RiverwoodAI()
 
-# Store conversation history
-conversation_history = []
+# Store conversation history per project so one site's answers never leak into another's prompt
+conversation_histories = {}
+
+def get_conversation_history_for(project_id: str) -> list:
+    return conversation_histories.setdefault(project_id, [])
 
 class ConnectionManager:
     def __init__(self):
@@ -69,26 +72,42 @@ async def read_index():
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
+        # The project is resolved once and bound to the session (ws://.../ws?project_id=...)
+        try:
+            project_id = ai_agent.resolve_project_id(websocket.query_params.get("project_id"))
+        except ValueError as e:
+            await websocket.send_text(json.dumps({"type": "error", "text": str(e)}))
+            await websocket.close()
+            manager.disconnect(websocket)
+            return
+        
         while True:
             data = await websocket.receive_text()
             # Handle incoming WebSocket messages
             try:
                 message_data = json.loads(data)
                 if message_data.get("type") == "text_input":
-                    await handle_text_input(message_data["text"], websocket)
+                    await handle_text_input(message_data["text"], websocket, project_id)
+                elif message_data.get("type") == "set_project":
+                    try:
+                        project_id = ai_agent.resolve_project_id(message_data.get("project_id"))
+                        await websocket.send_text(json.dumps({"type": "project", "project_id": project_id}))
+                    except ValueError as e:
+                        await websocket.send_text(json.dumps({"type": "error", "text": str(e)}))
             except json.JSONDecodeError:
                 print("Invalid JSON received")
                 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
-async def handle_text_input(text: str, websocket: WebSocket):
+async def handle_text_input(text: str, websocket: WebSocket, project_id: str):
     """Handle text input via WebSocket"""
     try:
         print(f"📨 Received text input: {text}")
+        conversation_history = get_conversation_history_for(project_id)
         
         # Get AI response
-        ai_response = ai_agent.generate_response(text, conversation_history)
+        ai_response = ai_agent.generate_response(text, conversation_history, project_id)
         
         # Update conversation history
         conversation_history.append({"user": text, "ai": ai_response})
@@ -119,8 +138,14 @@ async def handle_text_input(text: str, websocket: WebSocket):
         }))
 
 @app.post("/process_audio")
-async def process_audio(audio: UploadFile = File(...)):
+async def process_audio(audio: UploadFile = File(...), project_id: str = Form(None)):
     try:
+        try:
+            project_id = ai_agent.resolve_project_id(project_id)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        conversation_history = get_conversation_history_for(project_id)
+        
         print("🎤 Processing audio file...")
         
         # Save uploaded audio file
@@ -138,7 +163,7 @@ async def process_audio(audio: UploadFile = File(...)):
         
         # Get AI response
         print("🤖 Generating AI response...")
-        ai_response = ai_agent.generate_response(transcript, conversation_history)
+        ai_response = ai_agent.generate_response(transcript, conversation_history, project_id)
         
         # Update conversation history
         conversation_history.append({"user": transcript, "ai": ai_response})
@@ -184,14 +209,21 @@ async def process_audio(audio: UploadFile = File(...)):
 async def process_text(data: dict):
     try:
         text = data.get("text", "")
+        project_id = data.get("project_id")
         
         if not text:
             return {"success": False, "error": "No text provided"}
         
+        try:
+            project_id = ai_agent.resolve_project_id(project_id)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        conversation_history = get_conversation_history_for(project_id)
+        
         print(f"📨 Processing text: {text}")
         
         # Get AI response
-        ai_response = ai_agent.generate_response(text, conversation_history)
+        ai_response = ai_agent.generate_response(text, conversation_history, project_id)
         
         # Update conversation history
         conversation_history.append({"user": text, "ai": ai_response})
@@ -216,13 +248,31 @@ async def process_text(data: dict):
         return {"success": False, "error": str(e)}
 
 @app.get("/conversation_history")
-async def get_conversation_history():
-    return {"conversation_history": conversation_history}
+async def get_conversation_history(project_id: str = None):
+    project_id = project_id or ai_agent.status_store.default_project_id
+    return {"project_id": project_id, "conversation_history": conversation_histories.get(project_id, [])}
+
+@app.get("/construction_status")
+async def get_construction_status(project_id: str = None):
+    try:
+        return ai_agent.get_construction_update(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/projects")
+async def list_projects():
+    return {
+        "version": ai_agent.status_store.version,
+        "default_project_id": ai_agent.status_store.default_project_id,
+        "projects": ai_agent.status_store.project_ids()
+    }
 
 @app.post("/clear_history")
-async def clear_history():
-    global conversation_history
-    conversation_history = []
+async def clear_history(project_id: str = None):
+    if project_id:
+        conversation_histories.pop(project_id, None)
+        return {"success": True, "message": f"Conversation history cleared for {project_id}"}
+    conversation_histories.clear()
     return {"success": True, "message": "Conversation history cleared"}
 
 @app.get("/health")
@@ -234,7 +284,9 @@ async def health_check():
             "voice_handler": "active", 
             "ai_agent": "active",
             "whisper_model": "loaded" if voice_handler.stt_model else "failed",
-            "groq_api": groq_status
+            "whisper_config": f"{voice_handler.stt_model_size} ({voice_handler.stt_precision}, {voice_handler.stt_device})",
+            "groq_api": groq_status,
+            "status_store_version": ai_agent.status_store.version
         }
     }
 
@@ -0,0 +1,216 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Status source settings (override in .env)
+STATUS_SOURCE = os.getenv("STATUS_SOURCE", "")
+try:
+    STATUS_POLL_INTERVAL = float(os.getenv("STATUS_POLL_INTERVAL", "2"))
+    if STATUS_POLL_INTERVAL <= 0:
+        raise ValueError
+except ValueError:
+    print(f"Invalid STATUS_POLL_INTERVAL '{os.getenv('STATUS_POLL_INTERVAL')}', using 2 seconds")
+    STATUS_POLL_INTERVAL = 2.0
+DEFAULT_PROJECT_ID = os.getenv("DEFAULT_PROJECT_ID", "riverwood")
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Used when no source is configured or the source cannot be read on startup
+DEFAULT_PROJECT_STATUS = {
+    "foundation": "100% completed",
+    "structural": "85% completed",
+    "electrical": "60% completed",
+    "plumbing": "55% completed",
+    "next_milestone": "Structural completion by next Friday",
+    "site_visits": "Monday-Saturday, 10 AM - 5 PM"
+}
+
+
+def _status_value(project_id, key, value) -> str:
+    """Validate a single status value; only strings and numbers are accepted"""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{project_id}.{key}: expected a string or number, got {value!r}")
+    return str(value)
+
+
+def _load_json_source(path: str) -> dict:
+    """Read {project_id: {field: value}} from a JSON file.
+
+    Accepts either a top-level mapping of projects or {"projects": {...}}.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object of projects")
+    projects = data.get("projects", data)
+    if not isinstance(projects, dict):
+        raise ValueError("'projects' must be a JSON object")
+
+    result = {}
+    for project_id, status in projects.items():
+        if not isinstance(status, dict):
+            raise ValueError(f"{project_id}: expected an object of status fields, got {status!r}")
+        result[str(project_id)] = {str(k): _status_value(project_id, k, v) for k, v in status.items()}
+    return result
+
+
+def _load_sqlite_source(path: str) -> dict:
+    """Read {project_id: {field: value}} from a project_status(project_id, key, value) table"""
+    # Open read-only so a missing file is reported instead of created
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute("SELECT project_id, key, value FROM project_status").fetchall()
+    finally:
+        connection.close()
+
+    projects = {}
+    for project_id, key, value in rows:
+        projects.setdefault(str(project_id), {})[str(key)] = _status_value(project_id, key, value)
+    return projects
+
+
+class StatusStore:
+    """Versioned per-project construction status with hot reload.
+
+    Readers get the current snapshot dict without locking; reloads build a new
+    snapshot and swap it in, so a lookup never sees a half-applied update.
+    Unchanged projects keep their entry (and version) across reloads; a changed
+    project takes the store's new global version, so per-project versions only
+    ever increase, even when a project is removed and later added back.
+
+    Changes are detected by inode/mtime/size, so editors should replace the file
+    atomically (write a temp file, then rename over the source).
+    """
+
+    def __init__(self, source: str = STATUS_SOURCE, poll_interval: float = STATUS_POLL_INTERVAL,
+                 default_project_id: str = DEFAULT_PROJECT_ID):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.default_project_id = default_project_id
+        self.version = 0
+        self._projects = {}
+        self._listeners = []
+        self._source_signature = None
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watch_thread = None
+
+        # Seed with the built-in status so the agent still answers without a source
+        self._apply({default_project_id: dict(DEFAULT_PROJECT_STATUS)}, replace=False)
+        if self.source:
+            self.reload()
+
+    def get(self, project_id: str = None):
+        """Return {"version", "updated_at", "status"} for a project, or None if unknown"""
+        return self._projects.get(project_id or self.default_project_id)
+
+    def project_ids(self) -> list:
+        return list(self._projects)
+
+    def subscribe(self, callback):
+        """Register callback(changed_project_ids) run after each reload that changed something"""
+        self._listeners.append(callback)
+
+    def _read_source(self) -> dict:
+        if self.source.lower().endswith(SQLITE_EXTENSIONS):
+            return _load_sqlite_source(self.source)
+        return _load_json_source(self.source)
+
+    def _get_source_signature(self):
+        """inode/mtime/size of the source (plus SQLite WAL file) used to skip unchanged polls"""
+        signature = []
+        for path in (self.source, f"{self.source}-wal"):
+            try:
+                stat = os.stat(path)
+                # st_ino catches atomic-rename writes even within one coarse mtime tick
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def reload(self, force: bool = False) -> set:
+        """Re-read the source and apply changes; returns the project ids that changed"""
+        if not self.source:
+            return set()
+
+        with self._reload_lock:
+            signature = self._get_source_signature()
+            if not force and signature == self._source_signature:
+                return set()
+            # Recorded before reading so a bad source is reported once per change, not every poll
+            self._source_signature = signature
+
+            try:
+                projects = self._read_source()
+            except Exception as e:
+                print(f"❌ Failed to load project status from {self.source}: {e}")
+                return set()
+
+            if self.default_project_id not in projects:
+                # Requests without a project_id must still get real figures, not N/A
+                print(f"⚠️ Default project '{self.default_project_id}' missing from {self.source}, "
+                      f"keeping its last known status")
+                projects[self.default_project_id] = self._projects[self.default_project_id]["status"]
+
+            changed = self._apply(projects, replace=True)
+
+        if changed:
+            print(f"🔄 Project status v{self.version}: changed {', '.join(sorted(changed))}")
+            for callback in list(self._listeners):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    print(f"❌ Status listener error: {e}")
+        return changed
+
+    def _apply(self, projects: dict, replace: bool) -> set:
+        """Build the next snapshot, bumping versions only for projects that changed"""
+        current = self._projects
+        next_version = self.version + 1
+        updated_at = datetime.now().isoformat()
+        snapshot = {} if replace else dict(current)
+        changed = set()
+
+        for project_id, status in projects.items():
+            entry = current.get(project_id)
+            if entry and entry["status"] == status:
+                snapshot[project_id] = entry
+                continue
+            snapshot[project_id] = {
+                "version": next_version,
+                "updated_at": updated_at,
+                "status": status
+            }
+            changed.add(project_id)
+
+        # Projects dropped from the source count as changes too
+        changed.update(set(current) - set(snapshot))
+
+        if changed:
+            self._projects = snapshot
+            self.version = next_version
+        return changed
+
+    def start_watching(self):
+        """Poll the source in a background thread and reload on change"""
+        if not self.source or self._watch_thread:
+            return
+        self._stop_event.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, name="status-store-watcher", daemon=True)
+        self._watch_thread.start()
+        print(f"👀 Watching project status source: {self.source}")
+
+    def stop_watching(self):
+        self._stop_event.set()
+        if self._watch_thread:
+            self._watch_thread.join(timeout=self.poll_interval + 1)
+            self._watch_thread = None
+
+    def _watch_loop(self):
+        while not self._stop_event.wait(self.poll_interval):
+            self.reload()
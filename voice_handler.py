@@ -1,5 +1,8 @@
 import whisper
+from whisper.model import ModelDimensions, Whisper
+import torch
 import os
+from dataclasses import asdict
 from dotenv import load_dotenv
 import io
 import tempfile
@@ -14,13 +17,127 @@ import wave
 
 load_dotenv()
 
+# Whisper inference settings (override in .env)
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+WHISPER_PRECISION = os.getenv("WHISPER_PRECISION", "fp32").lower()
+WHISPER_CACHE_DIR = os.getenv(
+    "WHISPER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "riverwood", "whisper")
+)
+try:
+    WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+except ValueError:
+    print(f"Invalid WHISPER_CPU_THREADS '{os.getenv('WHISPER_CPU_THREADS')}', using torch default")
+    WHISPER_CPU_THREADS = 0
+
+SUPPORTED_PRECISIONS = ("fp32", "fp16", "int8")
+
+
+def _quantized_cache_path(model_size: str, cache_dir: str) -> str:
+    """Cache file for int8 weights, keyed on the library versions that produced them"""
+    file_name = f"{model_size}-int8-whisper{whisper.__version__}-torch{torch.__version__}.pt"
+    return os.path.join(cache_dir, file_name.replace("+", "_"))
+
+
+def _use_plain_linear(module: torch.nn.Module):
+    """Swap Whisper's Linear subclass for torch.nn.Linear so quantize_dynamic picks it up"""
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            linear.weight = child.weight
+            if child.bias is not None:
+                linear.bias = child.bias
+            setattr(module, name, linear)
+        else:
+            _use_plain_linear(child)
+
+
+def _quantize(model: Whisper) -> Whisper:
+    """Apply int8 dynamic quantization to Whisper's linear layers"""
+    _use_plain_linear(model)
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    model.eval()
+    return model
+
+
+def _load_quantized_model(model_size: str, cache_dir: str):
+    """Load Whisper with int8 dynamic quantization of its linear layers (CPU only)"""
+    cache_path = _quantized_cache_path(model_size, cache_dir) if cache_dir else None
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            # Only tensors and plain values are stored, so no code runs on load.
+            # weights_only loading of quantized tensors and q-dtypes needs torch >= 2.1
+            checkpoint = torch.load(cache_path, map_location="cpu", weights_only=True)
+            model = _quantize(Whisper(ModelDimensions(**checkpoint["dims"])))
+            model.load_state_dict(checkpoint["model_state_dict"])
+            # Alignment heads are not part of the state dict (same as whisper.load_model)
+            if model_size in whisper._ALIGNMENT_HEADS:
+                model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_size])
+            print(f"Loaded quantized Whisper weights from cache: {cache_path}")
+            return model
+        except Exception as e:
+            print(f"⚠️ WARNING: could not load quantized Whisper cache {cache_path} "
+                  f"(torch {torch.__version__}): {e}")
+            print("⚠️ WARNING: re-quantizing from fp32 weights; startup is slower and memory peaks higher "
+                  "until the cache loads (requires the torch version pinned in requirements.txt)")
+
+    model = _quantize(whisper.load_model(model_size, device="cpu"))
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temp file first so concurrent workers never read a partial file
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            torch.save({"dims": asdict(model.dims), "model_state_dict": model.state_dict()}, temp_path)
+            os.replace(temp_path, cache_path)
+            print(f"Quantized Whisper model cached at: {cache_path}")
+        except Exception as e:
+            print(f"Error caching quantized model: {e}")
+
+    return model
+
+
+def load_whisper_model(model_size: str = WHISPER_MODEL_SIZE,
+                       precision: str = WHISPER_PRECISION,
+                       cache_dir: str = WHISPER_CACHE_DIR):
+    """Load Whisper at the requested precision.
+
+    Returns (model, fp16, precision): fp16 is the flag to pass to transcribe()
+    and precision is the mode actually in use after any fallback.
+    fp16 needs CUDA and falls back to fp32 on CPU; int8 always runs on CPU;
+    fp32 uses CUDA when available, like whisper.load_model does by default.
+    """
+    if precision not in SUPPORTED_PRECISIONS:
+        print(f"Unknown Whisper precision '{precision}', using fp32")
+        precision = "fp32"
+
+    if precision == "int8":
+        return _load_quantized_model(model_size, cache_dir), False, "int8"
+
+    if precision == "fp16":
+        if torch.cuda.is_available():
+            return whisper.load_model(model_size, device="cuda"), True, "fp16"
+        print("fp16 requested but CUDA is not available, using fp32")
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return whisper.load_model(model_size, device=device), False, "fp32"
+
+
 class VoiceHandler:
-    def __init__(self):
+    def __init__(self, model_size: str = WHISPER_MODEL_SIZE, precision: str = WHISPER_PRECISION):
+        if WHISPER_CPU_THREADS > 0:
+            torch.set_num_threads(WHISPER_CPU_THREADS)
+
         # Initialize Whisper for Speech-to-Text
-        print("Loading Whisper model...")
+        print(f"Loading Whisper model ({model_size}, {precision})...")
+        self.stt_model_size = model_size
+        self.stt_precision = precision
+        self.stt_fp16 = False
+        self.stt_device = None
         try:
-            # Using base model for speed
-            self.stt_model = whisper.load_model("base")
+            self.stt_model, self.stt_fp16, self.stt_precision = load_whisper_model(model_size, precision)
+            self.stt_device = str(self.stt_model.device)
             print("Whisper model loaded successfully")
         except Exception as e:
             print(f"Error loading Whisper model: {e}")
@@ -60,7 +177,7 @@ class VoiceHandler:
             # Transcribe directly from numpy array
             result = self.stt_model.transcribe(
                 audio_np,
-                fp16=False,
+                fp16=self.stt_fp16,
                 language=None,
                 task="transcribe"
             )
@@ -93,7 +210,7 @@ class VoiceHandler:
             # Transcribe using Whisper
             result = self.stt_model.transcribe(
                 temp_audio_path,
-                fp16=False,
+                fp16=self.stt_fp16,
                 language=None,
                 task="transcribe"
             )